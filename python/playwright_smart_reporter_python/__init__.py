@@ -5,10 +5,25 @@ Python/pytest integration for the Playwright Smart Reporter.
 Converts pytest results to Smart Reporter format and generates
 HTML reports with AI-powered analysis.
 
-Requires Node.js 18+ at runtime (no npm install needed).
+The full interactive report needs Node.js 18+ at runtime (no npm install
+needed); without it a static summary is rendered in Python.
 """
 
-from .bridge import SmartReporterBridge
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bridge import SmartReporterBridge
 
 __version__ = "1.0.8"
 __all__ = ["SmartReporterBridge"]
+
+
+def __getattr__(name):
+    # Resolve the re-export on first access (PEP 562): pytest imports this
+    # package for the plugin entry point on every run, and most runs never
+    # touch the bridge.
+    if name == "SmartReporterBridge":
+        from .bridge import SmartReporterBridge
+
+        return SmartReporterBridge
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
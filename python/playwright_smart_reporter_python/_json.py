@@ -0,0 +1,38 @@
+"""
+JSON codec used on the report hot path.
+
+Uses orjson when it is installed (``pip install
+playwright-smart-reporter-python[perf]``) and falls back to the stdlib
+otherwise. Both functions work on bytes so payloads never take a detour
+through a Python str.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional [perf] extra
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(raw: bytes) -> Any:
+    """Parse a JSON document from bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            # orjson rejects NaN/Infinity, which the stdlib (and therefore
+            # pytest-json-report) happily writes - retry with the stdlib.
+            pass
+    return json.loads(raw)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialise obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. lone surrogates or integers wider than 64 bits
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
@@ -1,41 +1,24 @@
 """
 Bridge to call the Node.js Playwright Smart Reporter from Python.
 """
+import functools
+import hashlib
 import json
+import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 
-from .converter import convert_pytest_json
+# Static Node.js entry point shipped next to this module. It locates the
+# compiled generators via the PSR_GENERATORS_DIR environment variable.
+_GENERATE_SCRIPT = str(Path(__file__).resolve().parent / "generate-report.js")
 
-# Template for the Node.js script. {generators_dir} is injected as an absolute
-# path so require() resolves correctly regardless of cwd.  Internal relative
-# requires (../utils, ./card-generator, etc.) resolve relative to the loaded
-# file's own directory, so the preserved directory structure keeps them working.
-_GENERATE_SCRIPT_TEMPLATE = """\
-const fs = require('fs');
-const path = require('path');
-const {{ generateHtml }} = require('{generators_dir}/html-generator');
+_NODE_CMD = "node.exe" if sys.platform.startswith("win") else "node"
 
-const inputPath = process.argv[2];
-const outputPath = process.argv[3] || 'smart-report.html';
-
-if (!inputPath) {{
-  console.error('Usage: node .generate-report.js <data.json> [output.html]');
-  process.exit(1);
-}}
-
-const data = JSON.parse(fs.readFileSync(inputPath, 'utf8'));
-const html = generateHtml(data);
-
-const outDir = path.dirname(outputPath);
-if (outDir && outDir !== '.') {{
-  fs.mkdirSync(outDir, {{ recursive: true }});
-}}
-
-fs.writeFileSync(outputPath, html, 'utf8');
-"""
+_BACKENDS = ("auto", "node", "python")
 
 
 def _get_dist_root() -> Path:
@@ -47,18 +30,26 @@ def _get_dist_root() -> Path:
     2. Monorepo dist/ at the repository root (development)
 
     Returns the directory that contains generators/html-generator.js.
+    The result is memoised per (module location, cwd), so constructing
+    further bridges skips the filesystem walk.
     """
+    return _locate_dist_root(__file__, Path.cwd())
+
+
+@functools.lru_cache(maxsize=None)
+def _locate_dist_root(module_file: str, cwd: Path) -> Path:
+    # cwd is only part of the cache key; _find_monorepo_root reads it itself.
     # 1) Bundled inside the installed package
-    bundled = Path(__file__).resolve().parent / "_bundled_dist"
-    if (bundled / "generators" / "html-generator.js").is_file():
-        return bundled
+    bundled = os.path.join(os.path.dirname(os.path.realpath(module_file)), "_bundled_dist")
+    if _has_html_generator(bundled):
+        return Path(bundled)
 
     # 2) Monorepo layout
     monorepo = _find_monorepo_root()
     if monorepo is not None:
-        dist = monorepo / "dist"
-        if (dist / "generators" / "html-generator.js").is_file():
-            return dist
+        dist = os.path.join(monorepo, "dist")
+        if _has_html_generator(dist):
+            return Path(dist)
 
     raise RuntimeError(
         "Cannot find the compiled Smart Reporter JS files.\n"
@@ -67,6 +58,15 @@ def _get_dist_root() -> Path:
     )
 
 
+def _has_html_generator(root: str) -> bool:
+    # A single stat; the only file we need to see is the generator entry point.
+    try:
+        os.stat(os.path.join(root, "generators", "html-generator.js"))
+        return True
+    except OSError:
+        return False
+
+
 def _find_monorepo_root() -> Optional[Path]:
     """
     Walk upward looking for the playwright-smart-reporter package.json.
@@ -89,17 +89,113 @@ def _find_monorepo_root() -> Optional[Path]:
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def _is_valid_root(p: Path) -> bool:
-    pj = p / "package.json"
-    if not pj.exists():
+    # One open() instead of stat + open, and most package.json files met on
+    # the walk are rejected by a substring check without being parsed.
+    try:
+        with open(os.path.join(p, "package.json"), "rb") as f:
+            raw = f.read()
+    except OSError:
+        return False
+    if b'"playwright-smart-reporter"' not in raw:
         return False
+    # Could still just be a dependency entry - confirm the name field.
     try:
-        data = json.loads(pj.read_text(encoding="utf-8"))
+        data = json.loads(raw)
         return data.get("name") == "playwright-smart-reporter"
     except Exception:
         return False
 
 
+def _write_bytes(path: str, data: bytes) -> None:
+    # Payloads are written in a single call, straight from the bytes the
+    # codec produced - no str round trip, no Path objects.
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class _NodeWorker:
+    """
+    A persistent Node.js process that renders reports on demand.
+
+    Jobs are written to stdin as single-line JSON; each reply is a
+    "<status> <length>" header line followed by exactly that many bytes.
+    """
+
+    def __init__(self, env: Dict[str, str]):
+        # stderr goes to a temp file so a chatty generator can never fill a
+        # pipe buffer and deadlock us; it is only read back on failure.
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            [_NODE_CMD, _GENERATE_SCRIPT, "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            env=env,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def render(self, payload: bytes) -> bytes:
+        """Send one compact JSON payload and return the generated HTML."""
+        proc = self._proc
+        stdin, stdout = proc.stdin, proc.stdout
+        assert stdin is not None and stdout is not None  # both are PIPEs
+        # The stderr file spans the worker's lifetime; only this job's part
+        # belongs in an error message.
+        stderr_start = self._stderr.seek(0, os.SEEK_END)
+        try:
+            stdin.write(payload + b"\n")
+            stdin.flush()
+            header = stdout.readline()
+            status, _, size = header.decode("ascii").strip().partition(" ")
+            length = int(size)
+            body = stdout.read(length)
+        except (OSError, ValueError):
+            # Broken pipe, EOF (empty header) or a garbled header
+            body = None
+
+        if body is None or len(body) != length:
+            # The stream is out of sync or the process is gone - it cannot
+            # serve another job, so shut it down for the bridge to replace.
+            stderr = self._read_stderr(stderr_start)
+            self.close()
+            raise RuntimeError(f"Report generation failed:\n{stderr}")
+
+        if status != "ok":
+            raise RuntimeError(
+                f"Report generation failed:\n{body.decode('utf-8', 'replace')}"
+            )
+        return body
+
+    def close(self) -> None:
+        """Close stdin so Node exits its read loop, then reap the process."""
+        proc = self._proc
+        stdin, stdout = proc.stdin, proc.stdout
+        assert stdin is not None and stdout is not None  # both are PIPEs
+        try:
+            stdin.close()
+        except OSError:
+            # Broken pipe flushing a write Node never read
+            pass
+        if proc.poll() is None:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        stdout.close()
+        self._stderr.close()
+
+    def _read_stderr(self, start: int) -> str:
+        self._proc.poll()
+        self._stderr.seek(start)
+        return self._stderr.read().decode("utf-8", "replace")
+
+
 class SmartReporterBridge:
     """
     Bridge to generate Playwright Smart Reports from pytest results.
@@ -108,58 +204,201 @@ class SmartReporterBridge:
     1. Converting pytest JSON to Smart Reporter format
     2. Locating the compiled JS generators (bundled or monorepo)
     3. Calling the Node.js HTML generator
+
+    With ``persistent=True`` a single Node process is kept alive and reused
+    for every report, so only the first call pays Node startup and module
+    loading. Call ``close()`` (or use the bridge as a context manager) to
+    shut it down.
+
+    ``backend="python"`` renders a static summary report in-process (see
+    ``py_generator``) instead, without Node. ``backend="auto"`` uses Node
+    when it and the compiled generators are available, else Python.
     """
 
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        persistent: bool = False,
+        backend: str = "node",
+    ):
+        if backend not in _BACKENDS:
+            raise ValueError(
+                f"backend must be one of {', '.join(_BACKENDS)}, got {backend!r}"
+            )
         self.project_root = project_root or Path.cwd()
-        self._dist_root = _get_dist_root()
+        self.persistent = persistent
+        self._worker: Optional[_NodeWorker] = None
+
+        if backend == "auto":
+            backend = "python"
+            if shutil.which(_NODE_CMD):
+                try:
+                    self._dist_root = _get_dist_root()
+                    backend = "node"
+                except RuntimeError:
+                    pass
+        elif backend == "node":
+            self._dist_root = _get_dist_root()
+        self.backend = backend
+
+        if backend == "node":
+            self._env = {
+                **os.environ,
+                "PSR_GENERATORS_DIR": str((self._dist_root / "generators").resolve()),
+            }
+
+    def __enter__(self) -> "SmartReporterBridge":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the persistent Node worker, if one is running."""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+
+    def _get_worker(self) -> _NodeWorker:
+        if self._worker is not None and not self._worker.alive:
+            # Died since the last job (crash, process.exit, killed)
+            self.close()
+        if self._worker is None:
+            self._worker = _NodeWorker(self._env)
+        return self._worker
+
+    def _fingerprint(self, payload: bytes) -> bytes:
+        """Hash of everything that determines the report's HTML."""
+        digest = hashlib.blake2b(payload, digest_size=16)
+        if self.backend == "python":
+            from . import py_generator
+
+            scripts: Tuple[str, ...] = (py_generator.__file__,)
+        else:
+            generator = os.path.join(self._env["PSR_GENERATORS_DIR"], "html-generator.js")
+            scripts = (generator, _GENERATE_SCRIPT)
+        digest.update(self.backend.encode("ascii"))
+        for script in scripts:
+            digest.update(repr(os.path.getmtime(script)).encode("ascii"))
+        return digest.hexdigest().encode("ascii")
 
     def generate_report(
         self,
         pytest_json_path: Path,
         output_html: Path,
         data_json_path: Optional[Path] = None,
+        force: bool = False,
     ) -> None:
         """
         Generate Smart Report from pytest JSON results.
 
+        A fingerprint of the report data and generator is stored next to the
+        report (``<output_html>.key``); if it matches and the report exists,
+        Node is not run again.
+
         Args:
             pytest_json_path: Path to pytest-json-report output
             output_html: Path for output HTML report
-            data_json_path: Optional path to save intermediate data JSON
+            data_json_path: Optional path to save intermediate data JSON.
+                The data is piped straight to Node, so nothing is written
+                unless a path is given. Written compact; set PSR_DEBUG_JSON=1
+                for an indented copy.
+            force: Regenerate even if the report looks up to date
         """
-        # Convert pytest JSON to Smart Reporter format
-        html_data = convert_pytest_json(pytest_json_path)
-
-        # Save intermediate data
-        if data_json_path is None:
-            data_json_path = self.project_root / ".smart-reporter-data.json"
-        data_json_path.write_text(json.dumps(html_data, indent=2), encoding="utf-8")
+        self._generate(
+            pytest_json_path, output_html, data_json_path, force, self.persistent
+        )
 
-        # Build the generator script with absolute path to generators dir
-        generators_dir = (self._dist_root / "generators").resolve()
-        # Normalise to forward slashes for Node.js on all platforms
-        gen_dir_str = str(generators_dir).replace("\\", "/")
-        script_content = _GENERATE_SCRIPT_TEMPLATE.format(generators_dir=gen_dir_str)
+    def generate_reports(
+        self, jobs: Iterable[Tuple[Path, Path]], force: bool = False
+    ) -> None:
+        """
+        Generate several reports, paying Node startup only once.
 
-        script_path = self.project_root / ".generate-report.js"
-        script_path.write_text(script_content, encoding="utf-8")
+        Every job goes through a single worker process (the persistent one
+        if this bridge has it, otherwise a temporary one closed afterwards).
 
+        Args:
+            jobs: (pytest_json_path, output_html) pairs
+            force: Regenerate even if a report looks up to date
+        """
         try:
-            node_cmd = "node.exe" if sys.platform.startswith("win") else "node"
-            cmd = [
-                node_cmd,
-                str(script_path),
-                str(Path(data_json_path).resolve()),
-                str(Path(output_html).resolve()),
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                stderr = result.stderr or result.stdout
-                raise RuntimeError(f"Report generation failed:\n{stderr}")
+            for pytest_json_path, output_html in jobs:
+                self._generate(pytest_json_path, output_html, None, force, True)
         finally:
-            # Clean up the temporary script
-            if script_path.exists():
-                script_path.unlink()
+            if not self.persistent:
+                self.close()
+
+    def _generate(
+        self,
+        pytest_json_path: Path,
+        output_html: Path,
+        data_json_path: Optional[Path],
+        force: bool,
+        use_worker: bool,
+    ) -> None:
+        from .converter import convert_pytest_json_bytes
+
+        # Convert pytest JSON straight to Smart Reporter JSON bytes
+        payload = convert_pytest_json_bytes(pytest_json_path)
+
+        output_path = os.path.abspath(output_html)
+
+        if data_json_path is not None:
+            data_json = payload
+            if os.environ.get("PSR_DEBUG_JSON"):
+                # Pretty-print only on request; the compact form is ~2x smaller
+                data_json = json.dumps(json.loads(payload), indent=2).encode("utf-8")
+            _write_bytes(os.fspath(data_json_path), data_json)
+
+        key_path = output_path + ".key"
+        key = self._fingerprint(payload)
+        if not force and os.path.isfile(output_path):
+            try:
+                with open(key_path, "rb") as f:
+                    if f.read() == key:
+                        return
+            except OSError:
+                pass
+
+        self._render(payload, output_path, use_worker)
+        _write_bytes(key_path, key)
+
+    def _render(self, payload: bytes, output_path: str, use_worker: bool) -> None:
+        if self.backend == "python":
+            from . import _json
+            from .py_generator import generate_html
+
+            html = generate_html(_json.loads(payload)).encode("utf-8")
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            _write_bytes(output_path, html)
+            return
+
+        if use_worker:
+            worker = self._get_worker()
+            try:
+                html = worker.render(payload)
+            except RuntimeError:
+                if not worker.alive:
+                    self.close()
+                raise
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            _write_bytes(output_path, html)
+            return
+
+        cmd = [_NODE_CMD, _GENERATE_SCRIPT, "-", output_path]
+
+        # Node writes the HTML itself, so stdout is discarded; stdin carries
+        # the payload and is closed once it has been written.
+        result = subprocess.run(
+            cmd,
+            input=payload,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=self._env,
+            check=False,
+        )
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", "replace")
+            raise RuntimeError(f"Report generation failed:\n{stderr}")
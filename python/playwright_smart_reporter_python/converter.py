@@ -1,10 +1,22 @@
 """
 JSON converter: pytest-json-report format -> Playwright Smart Reporter format
 """
+import gc
 import json
-from datetime import datetime
+import os
+import sys
+import time
+from contextlib import contextmanager
+from json.encoder import encode_basestring_ascii as _quote
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from . import _json
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # optional [stream] extra
+    ijson = None
 
 
 def _to_ms(seconds: Optional[Union[float, int]]) -> int:
@@ -17,96 +29,305 @@ def _to_ms(seconds: Optional[Union[float, int]]) -> int:
         return 0
 
 
-def _extract_error(test: Dict[str, Any]) -> Optional[str]:
+_PHASES = ("call", "setup", "teardown")
+_EMPTY: Dict[str, Any] = {}
+
+
+def _extract_error(
+    test: Dict[str, Any],
+    _phases=_PHASES,
+    _isinstance=isinstance,
+    _dumps=_json.dumps,
+) -> Optional[str]:
     """Extract error message from pytest test result."""
-    for phase in ("call", "setup", "teardown"):
-        data = test.get(phase) or {}
-        longrepr = data.get("longrepr")
-        if longrepr:
-            if isinstance(longrepr, str):
-                return longrepr
-            if isinstance(longrepr, dict):
-                return longrepr.get("message") or json.dumps(longrepr)
-            return str(longrepr)
+    # Defaults bind the globals as locals; passing tests (the common case)
+    # then cost three cheap probes.
+    for phase in _phases:
+        report = test.get(phase) or _EMPTY
+        longrepr = report.get("longrepr")
+        # Under xdist every phase carries a "[gw0] <platform>" longrepr,
+        # passed ones included - only failed/skipped ones hold an error.
+        if not longrepr or report.get("outcome") == "passed":
+            continue
+        if _isinstance(longrepr, str):
+            return longrepr
+        if _isinstance(longrepr, dict):
+            return longrepr.get("message") or _dumps(longrepr).decode("utf-8")
+        return str(longrepr)
     return None
 
 
+# pytest outcome -> Playwright status / outcome enum. Anything else
+# (error, xfailed, missing, ...) is treated as a failure.
+_STATUS: Dict[Optional[str], str] = {
+    "passed": "passed",
+    "failed": "failed",
+    "skipped": "skipped",
+}
+_OUTCOME: Dict[Optional[str], str] = {"passed": "expected", "skipped": "skipped"}
+
+
 def _status_from_outcome(outcome: Optional[str]) -> str:
     """Map pytest outcome to Playwright status."""
-    if outcome == "passed":
-        return "passed"
-    if outcome == "failed":
-        return "failed"
-    if outcome == "skipped":
-        return "skipped"
-    return "failed"
+    return _STATUS.get(outcome, "failed")
 
 
 def _playwright_outcome(outcome: Optional[str]) -> str:
     """Map pytest outcome to Playwright outcome enum."""
-    if outcome == "passed":
-        return "expected"
-    if outcome == "skipped":
-        return "skipped"
-    return "unexpected"
+    return _OUTCOME.get(outcome, "unexpected")
+
+
+# Keys every converted result carries (the TestResultData fields the HTML
+# generator reads).
+REQUIRED_RESULT_KEYS = frozenset({
+    "testId", "title", "file", "status", "duration",
+    "error", "retry", "outcome", "expectedStatus",
+    "steps", "history", "tags", "attachments",
+})
+
+
+def _convert_test(test: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a single pytest-json-report test entry to a Smart Reporter result."""
+    nodeid = test.get("nodeid", "unknown::test")
+
+    # Parse test file and name from nodeid
+    file_part, sep, title = nodeid.partition("::")
+    if not sep:
+        file_part, title = "unknown", nodeid
+    # A suite has far fewer files than tests - share one str per file
+    file_part = sys.intern(file_part)
+
+    outcome = test.get("outcome")
+    keywords = test.get("keywords", [])
+
+    return {
+        "testId": nodeid,
+        "title": title,
+        "file": file_part,
+        "status": _STATUS.get(outcome, "failed"),
+        "duration": _to_ms(test.get("duration")),
+        "error": _extract_error(test),
+        "retry": 0,
+        "outcome": _OUTCOME.get(outcome, "unexpected"),
+        "expectedStatus": "passed",
+        "steps": [],
+        "history": [],
+        "tags": keywords if isinstance(keywords, list) else [],
+        # Built per result (not shared) since callers get the dict back
+        "attachments": {
+            "screenshots": [],
+            "videos": [],
+            "traces": [],
+            "custom": [],
+        },
+    }
+
+
+# JSON twin of _convert_test for convert_pytest_json_bytes: the fixed parts
+# are pre-rendered, strings are escaped by the stdlib's C encoder. Keep the
+# two in sync (test_converter compares their output).
+_RESULT_TEMPLATE = (
+    '{"testId":%s,"title":%s,"file":%s,"status":"%s","duration":%d,'
+    '"error":%s,"retry":0,"outcome":"%s","expectedStatus":"passed",'
+    '"steps":[],"history":[],"tags":[%s],'
+    '"attachments":{"screenshots":[],"videos":[],"traces":[],"custom":[]}}'
+)
+
+
+def _tags_json(keywords: Any) -> str:
+    if not isinstance(keywords, list):
+        return ""
+    try:
+        return ",".join(map(_quote, keywords))
+    except TypeError:
+        # Non-string keyword - let the full encoder deal with it
+        return json.dumps(keywords)[1:-1]
+
+
+def _result_json(test: Dict[str, Any]) -> str:
+    """Render a single test entry straight to (ASCII) JSON."""
+    nodeid = test.get("nodeid", "unknown::test")
+
+    file_part, sep, title = nodeid.partition("::")
+    if not sep:
+        file_part, title = "unknown", nodeid
+
+    outcome = test.get("outcome")
+    error = _extract_error(test)
+
+    return _RESULT_TEMPLATE % (
+        _quote(nodeid),
+        _quote(title),
+        _quote(file_part),
+        _STATUS.get(outcome, "failed"),
+        _to_ms(test.get("duration")),
+        "null" if error is None else _quote(error),
+        _OUTCOME.get(outcome, "unexpected"),
+        _tags_json(test.get("keywords", [])),
+    )
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Suspend the cyclic garbage collector for a bulk load/convert.
+
+    Parsing and converting allocate several containers per test, which
+    keeps triggering collections that scan everything built so far - most
+    of the run time on large reports. Nothing built here forms a cycle, so
+    those passes never free anything.
+    """
+    if not gc.isenabled():
+        yield
+        return
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+# Even with PSR_STREAM_JSON set, reports smaller than this are parsed in
+# one go - a streaming parser only pays off once the tree gets big.
+_STREAM_MIN_BYTES = 1 << 20
+
+
+def _iter_tests(path: str) -> Iterator[Dict[str, Any]]:
+    yielded = 0
+    try:
+        with open(path, "rb") as f:
+            for test in ijson.items(f, "tests.item", use_float=True):
+                yield test
+                yielded += 1
+    except ijson.JSONError:
+        # e.g. NaN/Infinity, which ijson rejects - finish from a full parse
+        tests = _json.loads(Path(path).read_bytes()).get("tests", [])
+        yield from tests[yielded:]
+
+
+def _load_report(pytest_json_path: Path) -> Dict[str, Any]:
+    """
+    Load the parts of a pytest-json-report file the converter uses.
+
+    With PSR_STREAM_JSON=1 and ijson installed, large reports are streamed:
+    "tests" is then an iterator over the entries, and everything else in
+    the report (environment, collectors, warnings, ...) is never built.
+    This lowers peak memory but is slower than the default full parse.
+    """
+    path = os.fspath(pytest_json_path)
+    if (
+        ijson is None
+        or not os.environ.get("PSR_STREAM_JSON")
+        or os.path.getsize(path) < _STREAM_MIN_BYTES
+    ):
+        return _json.loads(Path(path).read_bytes())
+
+    # pytest-json-report writes "created" first, so this stops right away
+    try:
+        with open(path, "rb") as f:
+            created = next(ijson.items(f, "created", use_float=True), None)
+    except ijson.JSONError:
+        return _json.loads(Path(path).read_bytes())
+    return {"created": created, "tests": _iter_tests(path)}
+
+
+# Below this many tests a process pool costs more to start than it saves.
+_PARALLEL_MIN_TESTS = 2000
+
+
+def _convert_chunk(tests: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert a slice of tests. Module-level so worker processes can pickle it."""
+    return [_convert_test(test) for test in tests]
 
 
-def convert_pytest_json(pytest_json_path: Path) -> Dict[str, Any]:
+def _convert_parallel(tests: List[Dict[str, Any]], workers: int) -> List[Dict[str, Any]]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(tests) // workers)
+    chunks = [tests[i : i + size] for i in range(0, len(tests), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [result for chunk in executor.map(_convert_chunk, chunks) for result in chunk]
+
+
+def convert_pytest_data(
+    data: Dict[str, Any], workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Convert an already-parsed pytest-json-report document.
+
+    Args:
+        data: Parsed pytest-json-report JSON
+        workers: See ``convert_pytest_json``
+
+    Returns:
+        Dictionary in Smart Reporter HtmlGeneratorData format
+    """
+    with _gc_paused():
+        tests = data.get("tests", [])
+
+        if workers and workers > 1:
+            # Streamed tests have to be materialised to be split up
+            tests = list(tests)
+        else:
+            workers = 1
+        if workers > 1 and len(tests) >= _PARALLEL_MIN_TESTS:
+            results = _convert_parallel(tests, workers)
+        else:
+            results = _convert_chunk(tests)
+
+    return _html_data(data, results)
+
+
+def convert_pytest_json(
+    pytest_json_path: Path, workers: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Convert pytest JSON report to Playwright Smart Reporter data format.
 
     Args:
         pytest_json_path: Path to pytest-json-report output file
+        workers: Convert in this many worker processes for reports with at
+            least 2000 tests. Serial by default - shipping tests to and from
+            the workers costs about as much as converting them, so this
+            only pays off with many spare cores (``os.cpu_count() - 2`` is
+            a good starting point).
 
     Returns:
         Dictionary in Smart Reporter HtmlGeneratorData format
     """
-    data = json.loads(pytest_json_path.read_text(encoding="utf-8"))
-    created = data.get("created") or datetime.utcnow().timestamp()
-    tests: List[Dict[str, Any]] = data.get("tests", [])
+    with _gc_paused():
+        return convert_pytest_data(_load_report(pytest_json_path), workers)
 
-    results: List[Dict[str, Any]] = []
 
-    for test in tests:
-        nodeid = test.get("nodeid", "unknown::test")
+def convert_pytest_json_bytes(pytest_json_path: Path) -> bytes:
+    """
+    Convert pytest JSON report straight to Smart Reporter JSON bytes.
 
-        # Parse test file and name from nodeid
-        if "::" in nodeid:
-            parts = nodeid.split("::")
-            file_part = parts[0]
-            title = "::".join(parts[1:])
-        else:
-            file_part, title = "unknown", nodeid
-
-        outcome = test.get("outcome")
-        duration = test.get("duration")
-        error = _extract_error(test)
-
-        # Extract additional metadata
-        keywords = test.get("keywords", [])
-
-        results.append(
-            {
-                "testId": nodeid,
-                "title": title,
-                "file": file_part,
-                "status": _status_from_outcome(outcome),
-                "duration": _to_ms(duration),
-                "error": error,
-                "retry": 0,
-                "outcome": _playwright_outcome(outcome),
-                "expectedStatus": "passed",
-                "steps": [],
-                "history": [],
-                "tags": keywords if isinstance(keywords, list) else [],
-                "attachments": {
-                    "screenshots": [],
-                    "videos": [],
-                    "traces": [],
-                    "custom": [],
-                },
-            }
-        )
+    Equivalent to serialising ``convert_pytest_json(pytest_json_path)``,
+    but each result is rendered directly to JSON, skipping the per-test
+    dicts entirely. Use this when the data is only going to be handed on
+    (e.g. to the Node generator).
+
+    Args:
+        pytest_json_path: Path to pytest-json-report output file
+
+    Returns:
+        UTF-8 (in fact ASCII) encoded HtmlGeneratorData JSON
+    """
+    with _gc_paused():
+        data = _load_report(pytest_json_path)
+        results = ",".join([_result_json(test) for test in data.get("tests", [])])
+
+    # The envelope serialises as '{"results":[],...}' - splice results in.
+    envelope = json.dumps(_html_data(data, []), separators=(",", ":"))
+    head = '{"results":['
+    return (head + results + envelope[len(head):]).encode("ascii")
+
+
+def _html_data(data: Dict[str, Any], results: List[Any]) -> Dict[str, Any]:
+    """Wrap converted results in the HtmlGeneratorData envelope."""
+    # float() also accepts a "created" written as a string
+    created_ms = int(float(data.get("created") or time.time()) * 1000)
 
     html_data: Dict[str, Any] = {
         "results": results,
@@ -115,7 +336,7 @@ def convert_pytest_json(pytest_json_path: Path) -> Dict[str, Any]:
             "tests": {},
             "summaries": [],
         },
-        "startTime": int(float(created) * 1000),
+        "startTime": created_ms,
         "options": {
             # Feature flags - enable what makes sense for pytest
             "enableTraceViewer": False,
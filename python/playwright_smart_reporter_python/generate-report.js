@@ -0,0 +1,74 @@
+/**
+ * Node.js entry point used by SmartReporterBridge.
+ *
+ * Usage:
+ *   node generate-report.js <data.json|-> [output.html]
+ *   node generate-report.js --worker
+ *
+ * PSR_GENERATORS_DIR must be the absolute path of the compiled generators/
+ * directory (bundled or monorepo dist). Internal relative requires
+ * (../utils, ./card-generator, etc.) resolve relative to html-generator.js
+ * itself, so the preserved directory structure keeps them working.
+ *
+ * In --worker mode the process stays alive, reads one JSON document per line
+ * from stdin and answers each with a "<status> <byte-length>\n" header
+ * followed by the HTML (or error text), so html-generator and its
+ * dependency tree are only loaded once.
+ */
+const fs = require('fs');
+const path = require('path');
+
+const generatorsDir = process.env.PSR_GENERATORS_DIR;
+if (!generatorsDir) {
+  console.error('PSR_GENERATORS_DIR is not set');
+  process.exit(1);
+}
+const { generateHtml } = require(path.join(generatorsDir, 'html-generator'));
+
+function render(data) {
+  const report = generateHtml(data);
+  return typeof report === 'string' ? report : report.html;
+}
+
+function respond(status, body) {
+  const buf = Buffer.from(body, 'utf8');
+  process.stdout.write(status + ' ' + buf.length + '\n');
+  process.stdout.write(buf);
+}
+
+function runWorker() {
+  const readline = require('readline');
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  rl.on('line', (line) => {
+    if (!line) return;
+    try {
+      respond('ok', render(JSON.parse(line)));
+    } catch (err) {
+      respond('error', String((err && err.stack) || err));
+    }
+  });
+}
+
+function runOnce(inputPath, outputPath) {
+  // '-' means the data JSON is piped on stdin (fd 0)
+  const data = JSON.parse(fs.readFileSync(inputPath === '-' ? 0 : inputPath, 'utf8'));
+  const html = render(data);
+
+  const outDir = path.dirname(outputPath);
+  if (outDir && outDir !== '.') {
+    fs.mkdirSync(outDir, { recursive: true });
+  }
+
+  fs.writeFileSync(outputPath, html, 'utf8');
+}
+
+if (process.argv[2] === '--worker') {
+  runWorker();
+} else {
+  const inputPath = process.argv[2];
+  if (!inputPath) {
+    console.error('Usage: node generate-report.js <data.json|-> [output.html]');
+    process.exit(1);
+  }
+  runOnce(inputPath, process.argv[3] || 'smart-report.html');
+}
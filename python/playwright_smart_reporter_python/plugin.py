@@ -3,14 +3,11 @@ Pytest plugin for automatic Smart Reporter generation.
 
 Registered via the pytest11 entry point in pyproject.toml.
 """
-import json
+import os
 from pathlib import Path
-from typing import Optional
 
 import pytest
 
-from .bridge import SmartReporterBridge
-
 
 def pytest_addoption(parser):
     """Add command-line options for Smart Reporter."""
@@ -27,6 +24,61 @@ def pytest_addoption(parser):
         default="smart-report.html",
         help="Output path for Smart Report HTML (default: smart-report.html)",
     )
+    group.addoption(
+        "--smart-reporter-workers",
+        action="store",
+        default="auto",
+        help=(
+            "Run tests in N pytest-xdist workers when xdist is installed and "
+            "-n is not given (default: auto = CPU count - 2, 0 disables)"
+        ),
+    )
+
+
+def _default_workers(value: str) -> int:
+    if value == "auto":
+        return max(1, (os.cpu_count() or 1) - 2)
+    try:
+        return int(value)
+    except ValueError:
+        raise pytest.UsageError(
+            f"--smart-reporter-workers must be an integer or 'auto', got {value!r}"
+        ) from None
+
+
+def _has_xdist_args(args) -> bool:
+    # Read the command line itself (addopts included): the parsed namespace
+    # has the same "no" for --dist whether or not it was given.
+    return any(
+        arg in ("--numprocesses", "--dist")
+        or arg.startswith(("-n", "--numprocesses=", "--dist="))
+        for arg in args
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_load_initial_conftests(early_config, parser, args):
+    """Parallelise --smart-reporter runs with pytest-xdist unless told otherwise."""
+    ns = early_config.known_args_namespace
+    if not getattr(ns, "smart_reporter", False):
+        return
+    # Respect explicit -n/--dist (even --dist no) and -p no:xdist. Workers
+    # see the original command line too, but xdist resets -n/--dist on their
+    # config before pytest_configure, so the extra args are inert there.
+    if not early_config.pluginmanager.has_plugin("xdist"):
+        return
+    if _has_xdist_args(args):
+        return
+    # xdist refuses to run with either debugger flag
+    if getattr(ns, "usepdb", False) or getattr(ns, "trace", False):
+        return
+
+    workers = _default_workers(getattr(ns, "smart_reporter_workers", "auto"))
+    if workers < 2:
+        return
+
+    # loadfile keeps each file on one worker, so json-report rows stay grouped
+    args[:] = [*args, "-n", str(workers), "--dist", "loadfile"]
 
 
 def pytest_configure(config):
@@ -35,6 +87,12 @@ def pytest_configure(config):
     if not config.getoption("--smart-reporter", default=False):
         return
 
+    # Under xdist the controller writes the merged json-report and builds the
+    # Smart Report; workers must not. (Not PYTEST_XDIST_WORKER: a pytest run
+    # started from inside a worker inherits it.)
+    if hasattr(config, "workerinput"):
+        return
+
     # Ensure pytest-json-report is configured
     if hasattr(config.option, "json_report"):
         config.option.json_report = True
@@ -68,11 +126,23 @@ class SmartReporterPlugin:
             return
 
         try:
-            bridge = SmartReporterBridge()
+            # Imported here so installing the plugin costs nothing for runs
+            # without --smart-reporter (and for every xdist worker).
+            from .bridge import SmartReporterBridge
+
+            bridge = SmartReporterBridge(backend="auto")
+            if bridge.backend != "node":
+                print(
+                    "\n⚠️  Node.js or the compiled Smart Reporter generator not found, "
+                    "generating the static Python report instead"
+                )
             bridge.generate_report(
                 pytest_json_path=pytest_json,
                 output_html=self.output_path,
             )
-            print(f"\n📊 Smart Report generated: {self.output_path.absolute()}")
+            print(
+                f"\n📊 Smart Report generated ({bridge.backend} backend): "
+                f"{self.output_path.absolute()}"
+            )
         except Exception as e:
             print(f"\n❌ Failed to generate Smart Report: {e}")
@@ -0,0 +1,157 @@
+"""
+Pure-Python HTML generator for Smart Reporter data.
+
+Renders a static summary report (stats plus a per-test table with errors)
+from the data produced by ``convert_pytest_json``, without Node.js. It
+covers what the pytest bridge feeds the JS generator today, but none of
+the interactive features (trends, AI suggestions, clustering, filters) -
+use the Node backend for those.
+"""
+from datetime import datetime, timezone
+from html import escape
+from typing import Any, Dict, List
+
+_STATUS_LABELS = {
+    "passed": "Passed",
+    "failed": "Failed",
+    "timedOut": "Timed out",
+    "skipped": "Skipped",
+    "interrupted": "Interrupted",
+}
+
+# Same palette and layout vocabulary as the JS report's dark theme
+_STYLES = """\
+:root {
+  --bg-primary: #0a0a0f;
+  --bg-card: #1a1a24;
+  --border-subtle: #2a2a3a;
+  --text-primary: #f0f0f5;
+  --text-secondary: #8888a0;
+  --accent-green: #00ff88;
+  --accent-red: #ff4466;
+  --accent-yellow: #ffcc00;
+  --accent-blue: #00aaff;
+}
+* { box-sizing: border-box; }
+body {
+  margin: 0; padding: 32px; background: var(--bg-primary); color: var(--text-primary);
+  font-family: system-ui, -apple-system, 'Segoe UI', Roboto, sans-serif;
+}
+h1 { margin: 0 0 4px; font-size: 24px; }
+.meta { color: var(--text-secondary); margin-bottom: 24px; }
+.stats { display: flex; gap: 16px; flex-wrap: wrap; margin-bottom: 24px; }
+.stat-card {
+  background: var(--bg-card); border: 1px solid var(--border-subtle);
+  border-radius: 8px; padding: 16px 20px; min-width: 120px;
+}
+.stat-value { font-size: 28px; font-weight: 600; }
+.stat-label { color: var(--text-secondary); font-size: 13px; }
+.passed { color: var(--accent-green); }
+.failed, .timedOut, .interrupted { color: var(--accent-red); }
+.skipped { color: var(--accent-yellow); }
+table { width: 100%; border-collapse: collapse; background: var(--bg-card); border-radius: 8px; }
+th, td { text-align: left; padding: 10px 14px; border-bottom: 1px solid var(--border-subtle); vertical-align: top; }
+th { color: var(--text-secondary); font-weight: 500; font-size: 13px; }
+td.file, td.duration { color: var(--text-secondary); white-space: nowrap; }
+summary { cursor: pointer; color: var(--accent-blue); }
+pre {
+  margin: 8px 0 0; white-space: pre-wrap; word-break: break-word;
+  font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size: 12px;
+}
+"""
+
+
+def _format_duration(ms: float) -> str:
+    """Python twin of utils/formatters.ts formatDuration."""
+    if ms < 1000:
+        return f"{round(ms)}ms"
+    if ms < 60000:
+        return f"{ms / 1000:.1f}s"
+    return f"{ms / 60000:.1f}m"
+
+
+def _counts(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    # Outcome-based counting, mirroring html-generator.ts
+    passed = sum(
+        1
+        for r in results
+        if r.get("status") == "passed" or r.get("outcome") in ("expected", "flaky")
+    )
+    failed = sum(
+        1
+        for r in results
+        if r.get("outcome") == "unexpected" and r.get("status") in ("failed", "timedOut")
+    )
+    skipped = sum(1 for r in results if r.get("status") == "skipped")
+    return {"total": len(results), "passed": passed, "failed": failed, "skipped": skipped}
+
+
+def _test_row(result: Dict[str, Any]) -> str:
+    status = result.get("status", "failed")
+    error = result.get("error")
+    title = escape(result.get("title", ""))
+    if error:
+        title += (
+            f"<details><summary>Error</summary><pre>{escape(error)}</pre></details>"
+        )
+    return (
+        "<tr>"
+        f'<td class="{escape(status)}">{escape(_STATUS_LABELS.get(status, status))}</td>'
+        f"<td>{title}</td>"
+        f'<td class="file">{escape(result.get("file", ""))}</td>'
+        f'<td class="duration">{_format_duration(result.get("duration", 0))}</td>'
+        "</tr>"
+    )
+
+
+def generate_html(data: Dict[str, Any]) -> str:
+    """
+    Render Smart Reporter data (HtmlGeneratorData shape) to a standalone page.
+
+    Args:
+        data: Output of ``convert_pytest_json``
+
+    Returns:
+        Complete HTML document
+    """
+    results: List[Dict[str, Any]] = data.get("results", [])
+    counts = _counts(results)
+    total = counts["total"]
+    pass_rate = round(counts["passed"] / total * 100) if total else 0
+    duration = sum(r.get("duration", 0) for r in results)
+    started = datetime.fromtimestamp(data.get("startTime", 0) / 1000, tz=timezone.utc)
+
+    stats = "".join(
+        f'<div class="stat-card"><div class="stat-value {cls}">{value}</div>'
+        f'<div class="stat-label">{label}</div></div>'
+        for cls, value, label in (
+            ("", total, "Total"),
+            ("passed", counts["passed"], "Passed"),
+            ("failed", counts["failed"], "Failed"),
+            ("skipped", counts["skipped"], "Skipped"),
+            ("", f"{pass_rate}%", "Pass rate"),
+            ("", _format_duration(duration), "Duration"),
+        )
+    )
+    rows = "".join(_test_row(r) for r in results)
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Smart Report</title>
+<style>
+{_STYLES}</style>
+</head>
+<body>
+<h1>Smart Report</h1>
+<div class="meta">Started {started:%Y-%m-%d %H:%M:%S} UTC</div>
+<div class="stats">{stats}</div>
+<table>
+<thead><tr><th>Status</th><th>Test</th><th>File</th><th>Duration</th></tr></thead>
+<tbody>{rows}</tbody>
+</table>
+</body>
+</html>
+"""
@@ -5,6 +5,7 @@ Bundle the pre-built Node.js dist/ files into the Python package.
 Run from the python/ directory (or repo root) after `npm run build`:
     python scripts/bundle_dist.py
 """
+import os
 import shutil
 import sys
 from pathlib import Path
@@ -37,12 +38,20 @@ def bundle(repo_root: Path) -> None:
     if dest.exists():
         shutil.rmtree(dest)
 
+    # List each source directory once instead of stat-ing every file
+    present = {}
     missing = []
     for rel in REQUIRED_FILES:
-        src = dist_src / rel
-        if not src.exists():
+        folder, _, name = rel.rpartition("/")
+        if folder not in present:
+            try:
+                present[folder] = set(os.listdir(dist_src / folder))
+            except FileNotFoundError:
+                present[folder] = set()
+        if name not in present[folder]:
             missing.append(rel)
             continue
+        src = dist_src / rel
         target = dest / rel
         target.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(src, target)
@@ -1,10 +1,25 @@
+import json
 from pathlib import Path
 
 import pytest
 
+from playwright_smart_reporter_python.converter import convert_pytest_json
+
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_report_path():
     return FIXTURES_DIR / "sample_pytest_report.json"
+
+
+@pytest.fixture(scope="session")
+def sample_raw(sample_report_path):
+    """The sample report parsed once per session - treat as read-only."""
+    return json.loads(sample_report_path.read_bytes())
+
+
+@pytest.fixture(scope="session")
+def converted_sample(sample_report_path):
+    """The sample report converted once per session - treat as read-only."""
+    return convert_pytest_json(sample_report_path)
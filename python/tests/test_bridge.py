@@ -1,3 +1,6 @@
+import json
+import os
+import shutil
 import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -22,6 +25,13 @@ class TestIsValidRoot:
         pj.write_text('{"name": "some-other-package"}')
         assert _is_valid_root(tmp_path) is False
 
+    def test_name_only_as_dependency(self, tmp_path):
+        pj = tmp_path / "package.json"
+        pj.write_text(
+            '{"name": "consumer", "devDependencies": {"playwright-smart-reporter": "^1.4.0"}}'
+        )
+        assert _is_valid_root(tmp_path) is False
+
     def test_no_package_json(self, tmp_path):
         assert _is_valid_root(tmp_path) is False
 
@@ -69,6 +79,25 @@ class TestGetDistRoot:
                 result = _get_dist_root()
                 assert result == monorepo / "dist"
 
+    def test_lookup_is_cached(self, tmp_path):
+        monorepo = tmp_path / "repo"
+        dist = monorepo / "dist" / "generators"
+        dist.mkdir(parents=True)
+        (dist / "html-generator.js").write_text("// monorepo")
+
+        with patch(
+            "playwright_smart_reporter_python.bridge._find_monorepo_root",
+            return_value=monorepo,
+        ) as mock_find:
+            with patch(
+                "playwright_smart_reporter_python.bridge.__file__",
+                str(tmp_path / "nonexistent" / "bridge.py"),
+            ):
+                assert _get_dist_root() == monorepo / "dist"
+                assert _get_dist_root() == monorepo / "dist"
+
+        assert mock_find.call_count == 1
+
     def test_raises_when_nothing_found(self):
         with patch(
             "playwright_smart_reporter_python.bridge.__file__",
@@ -94,56 +123,323 @@ class TestFindMonorepoRoot:
                 assert result is None
 
 
+def _fake_dist_bridge(tmp_path, generator_js="// fake", **kwargs):
+    """Bridge whose bundled dist is a lone html-generator.js under tmp_path."""
+    from playwright_smart_reporter_python.bridge import SmartReporterBridge
+
+    generators = tmp_path / "pkg" / "_bundled_dist" / "generators"
+    generators.mkdir(parents=True)
+    (generators / "html-generator.js").write_text(generator_js)
+
+    with patch(
+        "playwright_smart_reporter_python.bridge.__file__",
+        str(tmp_path / "pkg" / "bridge.py"),
+    ):
+        return SmartReporterBridge(project_root=tmp_path, **kwargs)
+
+
+@pytest.fixture
+def fake_dist_bridge(tmp_path):
+    return _fake_dist_bridge(tmp_path)
+
+
 class TestSmartReporterBridge:
-    def test_node_failure_raises(self, tmp_path, sample_report_path):
+    def test_node_failure_raises(self, fake_dist_bridge, tmp_path, sample_report_path):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=1,
+                stderr=b"Error: Cannot find module",
+                stdout=b"",
+            )
+            with pytest.raises(RuntimeError, match="Report generation failed"):
+                fake_dist_bridge.generate_report(
+                    pytest_json_path=sample_report_path,
+                    output_html=tmp_path / "report.html",
+                )
+
+    def test_generate_report_calls_node(self, fake_dist_bridge, tmp_path, sample_report_path):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            fake_dist_bridge.generate_report(
+                pytest_json_path=sample_report_path,
+                output_html=tmp_path / "report.html",
+            )
+
+        mock_run.assert_called_once()
+        args = mock_run.call_args[0][0]
+        assert args[0] == "node"
+        assert "generate-report" in args[1]
+        assert mock_run.call_args[1]["stdout"] is subprocess.DEVNULL
+
+    def test_pipes_data_over_stdin(self, fake_dist_bridge, tmp_path, sample_report_path):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            fake_dist_bridge.generate_report(
+                pytest_json_path=sample_report_path,
+                output_html=tmp_path / "report.html",
+            )
+
+        args = mock_run.call_args[0][0]
+        assert args[1].endswith("generate-report.js")
+        assert args[2] == "-"
+        env = mock_run.call_args[1]["env"]
+        generators = tmp_path / "pkg" / "_bundled_dist" / "generators"
+        assert env["PSR_GENERATORS_DIR"] == str(generators.resolve())
+        payload = json.loads(mock_run.call_args[1]["input"])
+        assert len(payload["results"]) == 4
+        assert not (tmp_path / ".smart-reporter-data.json").exists()
+
+    def test_writes_data_json_when_requested(
+        self, fake_dist_bridge, tmp_path, sample_report_path
+    ):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stderr="", stdout="")
+            fake_dist_bridge.generate_report(
+                pytest_json_path=sample_report_path,
+                output_html=tmp_path / "report.html",
+                data_json_path=tmp_path / "data.json",
+            )
+
+        raw = (tmp_path / "data.json").read_text(encoding="utf-8")
+        assert "\n" not in raw
+        assert len(json.loads(raw)["results"]) == 4
+
+    def test_debug_json_is_indented(self, fake_dist_bridge, tmp_path, sample_report_path):
+        with patch("subprocess.run") as mock_run, patch.dict(
+            os.environ, {"PSR_DEBUG_JSON": "1"}
+        ):
+            mock_run.return_value = MagicMock(returncode=0, stderr=b"")
+            fake_dist_bridge.generate_report(
+                pytest_json_path=sample_report_path,
+                output_html=tmp_path / "report.html",
+                data_json_path=tmp_path / "data.json",
+            )
+
+        raw = (tmp_path / "data.json").read_text(encoding="utf-8")
+        assert raw.startswith('{\n  "results"')
+
+    def test_skips_unchanged_report(self, fake_dist_bridge, tmp_path, sample_report_path):
+        output = tmp_path / "report.html"
+
+        def fake_node(cmd, **kwargs):
+            Path(cmd[3]).write_text("<html></html>")
+            return MagicMock(returncode=0, stderr=b"")
+
+        bridge = fake_dist_bridge
+        with patch("subprocess.run", side_effect=fake_node) as mock_run:
+            bridge.generate_report(sample_report_path, output)
+            bridge.generate_report(sample_report_path, output)
+            assert mock_run.call_count == 1
+            assert (tmp_path / "report.html.key").exists()
+
+            bridge.generate_report(sample_report_path, output, force=True)
+            assert mock_run.call_count == 2
+
+            output.unlink()
+            bridge.generate_report(sample_report_path, output)
+            assert mock_run.call_count == 3
+
+
+FAKE_GENERATOR = """\
+exports.generateHtml = (data) => {
+  if (data.results.length === 0) throw new Error('no results');
+  if (data.results.length === 1) process.exit(3);
+  return { html: '<p>' + data.results.length + ' tests</p>' };
+};
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js not installed")
+class TestPersistentWorker:
+    @pytest.fixture
+    def bridge(self, tmp_path):
+        with _fake_dist_bridge(tmp_path, FAKE_GENERATOR, persistent=True) as bridge:
+            yield bridge
+
+    def test_reuses_one_node_process(self, bridge, tmp_path, sample_report_path):
+        first = tmp_path / "out" / "first.html"
+        second = tmp_path / "out" / "second.html"
+
+        bridge.generate_report(pytest_json_path=sample_report_path, output_html=first)
+        worker = bridge._worker
+        bridge.generate_report(pytest_json_path=sample_report_path, output_html=second)
+
+        assert bridge._worker is worker
+        assert first.read_text() == "<p>4 tests</p>"
+        assert second.read_text() == "<p>4 tests</p>"
+        assert not (tmp_path / ".smart-reporter-data.json").exists()
+
+    def test_generator_error_keeps_worker_alive(self, bridge, tmp_path, sample_report_path):
+        empty = tmp_path / "empty.json"
+        empty.write_text('{"created": 1700000000.0, "tests": []}')
+
+        with pytest.raises(RuntimeError, match="no results"):
+            bridge.generate_report(
+                pytest_json_path=empty, output_html=tmp_path / "empty.html"
+            )
+
+        bridge.generate_report(
+            pytest_json_path=sample_report_path, output_html=tmp_path / "ok.html"
+        )
+        assert (tmp_path / "ok.html").read_text() == "<p>4 tests</p>"
+
+    def test_respawns_after_worker_dies(self, bridge, tmp_path, sample_report_path):
+        one = tmp_path / "one.json"
+        one.write_text('{"created": 1700000000.0, "tests": [{"nodeid": "a.py::t"}]}')
+
+        with pytest.raises(RuntimeError, match="Report generation failed"):
+            bridge.generate_report(pytest_json_path=one, output_html=tmp_path / "x.html")
+        assert bridge._worker is None
+        assert not (tmp_path / "x.html").exists()
+
+        bridge.generate_report(
+            pytest_json_path=sample_report_path, output_html=tmp_path / "ok.html"
+        )
+        assert (tmp_path / "ok.html").read_text() == "<p>4 tests</p>"
+
+    def test_respawns_worker_that_died_between_jobs(
+        self, bridge, tmp_path, sample_report_path
+    ):
+        bridge.generate_report(
+            pytest_json_path=sample_report_path, output_html=tmp_path / "a.html"
+        )
+        dead = bridge._worker
+        dead._proc.kill()
+        dead._proc.wait()
+
+        bridge.generate_report(
+            pytest_json_path=sample_report_path,
+            output_html=tmp_path / "b.html",
+            force=True,
+        )
+        assert bridge._worker is not dead
+        assert (tmp_path / "b.html").read_text() == "<p>4 tests</p>"
+
+    def test_generate_reports_uses_one_process(self, tmp_path, sample_report_path):
+        bridge = _fake_dist_bridge(tmp_path, FAKE_GENERATOR)
+
+        outputs = [tmp_path / f"report-{i}.html" for i in range(3)]
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as mock_popen:
+            bridge.generate_reports([(sample_report_path, out) for out in outputs])
+
+        assert mock_popen.call_count == 1
+        assert bridge._worker is None
+        for out in outputs:
+            assert out.read_text() == "<p>4 tests</p>"
+
+    def test_close_stops_worker(self, bridge, tmp_path, sample_report_path):
+        bridge.generate_report(
+            pytest_json_path=sample_report_path, output_html=tmp_path / "r.html"
+        )
+        proc = bridge._worker._proc
+
+        bridge.close()
+
+        assert bridge._worker is None
+        assert proc.poll() is not None
+
+
+class TestBackend:
+    def test_python_backend_needs_no_node(self, tmp_path, sample_report_path):
         from playwright_smart_reporter_python.bridge import SmartReporterBridge
 
-        # Create fake dist
-        bundled = tmp_path / "pkg" / "_bundled_dist" / "generators"
-        bundled.mkdir(parents=True)
-        (bundled / "html-generator.js").write_text("// fake")
+        with patch(
+            "playwright_smart_reporter_python.bridge._get_dist_root",
+            side_effect=RuntimeError("Cannot find"),
+        ), patch("subprocess.run") as mock_run:
+            bridge = SmartReporterBridge(project_root=tmp_path, backend="python")
+            bridge.generate_report(
+                pytest_json_path=sample_report_path,
+                output_html=tmp_path / "out" / "report.html",
+            )
+
+        mock_run.assert_not_called()
+        html = (tmp_path / "out" / "report.html").read_text()
+        assert "test_valid_credentials" in html
+        assert (tmp_path / "out" / "report.html.key").exists()
+
+    def test_auto_falls_back_without_dist(self, tmp_path):
+        from playwright_smart_reporter_python.bridge import SmartReporterBridge
 
         with patch(
-            "playwright_smart_reporter_python.bridge.__file__",
-            str(tmp_path / "pkg" / "bridge.py"),
+            "playwright_smart_reporter_python.bridge._get_dist_root",
+            side_effect=RuntimeError("Cannot find"),
         ):
-            bridge = SmartReporterBridge(project_root=tmp_path)
+            assert SmartReporterBridge(backend="auto").backend == "python"
 
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(
-                    returncode=1,
-                    stderr="Error: Cannot find module",
-                    stdout="",
-                )
-                with pytest.raises(RuntimeError, match="Report generation failed"):
-                    bridge.generate_report(
-                        pytest_json_path=sample_report_path,
-                        output_html=tmp_path / "report.html",
-                    )
+    def test_auto_falls_back_without_node(self, tmp_path):
+        from playwright_smart_reporter_python.bridge import SmartReporterBridge
 
-    def test_generate_report_calls_node(self, tmp_path, sample_report_path):
+        with patch("shutil.which", return_value=None):
+            assert SmartReporterBridge(backend="auto").backend == "python"
+
+    def test_auto_prefers_node(self, tmp_path):
         from playwright_smart_reporter_python.bridge import SmartReporterBridge
 
-        bundled = tmp_path / "pkg" / "_bundled_dist" / "generators"
-        bundled.mkdir(parents=True)
-        (bundled / "html-generator.js").write_text("// fake")
+        with patch("shutil.which", return_value="/usr/bin/node"), patch(
+            "playwright_smart_reporter_python.bridge._get_dist_root",
+            return_value=tmp_path,
+        ):
+            assert SmartReporterBridge(backend="auto").backend == "node"
+
+    def test_node_backend_still_requires_dist(self):
+        from playwright_smart_reporter_python.bridge import SmartReporterBridge
 
         with patch(
-            "playwright_smart_reporter_python.bridge.__file__",
-            str(tmp_path / "pkg" / "bridge.py"),
+            "playwright_smart_reporter_python.bridge._get_dist_root",
+            side_effect=RuntimeError("Cannot find"),
         ):
-            bridge = SmartReporterBridge(project_root=tmp_path)
+            with pytest.raises(RuntimeError, match="Cannot find"):
+                SmartReporterBridge(backend="node")
 
-            with patch("subprocess.run") as mock_run:
-                mock_run.return_value = MagicMock(
-                    returncode=0, stderr="", stdout=""
-                )
-                bridge.generate_report(
-                    pytest_json_path=sample_report_path,
-                    output_html=tmp_path / "report.html",
-                )
+    def test_unknown_backend(self):
+        from playwright_smart_reporter_python.bridge import SmartReporterBridge
+
+        with pytest.raises(ValueError, match="backend"):
+            SmartReporterBridge(backend="ruby")
+
+
+class TestNodeWorkerProtocol:
+    @pytest.fixture
+    def make_worker(self):
+        import io
+        import tempfile
+
+        from playwright_smart_reporter_python.bridge import _NodeWorker
+
+        stderr_files = []
+
+        def make(stdout: bytes):
+            worker = _NodeWorker.__new__(_NodeWorker)
+            worker._stderr = tempfile.TemporaryFile()
+            worker._proc = MagicMock(stdout=io.BytesIO(stdout))
+            worker._proc.poll.return_value = 0
+            stderr_files.append(worker._stderr)
+            return worker
+
+        yield make
+        for f in stderr_files:
+            f.close()
+
+    def test_malformed_header(self, make_worker):
+        with pytest.raises(RuntimeError, match="Report generation failed"):
+            make_worker(b"garbage\n").render(b"{}")
+
+    def test_truncated_body(self, make_worker):
+        with pytest.raises(RuntimeError, match="Report generation failed"):
+            make_worker(b"ok 100\n<p>short").render(b"{}")
+
+    def test_eof(self, make_worker):
+        with pytest.raises(RuntimeError, match="Report generation failed"):
+            make_worker(b"").render(b"{}")
+
+    def test_error_omits_stderr_of_earlier_jobs(self, make_worker):
+        worker = make_worker(b"")
+        worker._stderr.write(b"noise from an earlier job\n")
+
+        with pytest.raises(RuntimeError) as exc_info:
+            worker.render(b"{}")
+        assert "earlier job" not in str(exc_info.value)
 
-                mock_run.assert_called_once()
-                args = mock_run.call_args[0][0]
-                assert args[0] == "node"
-                assert "generate-report" in args[1]
+    def test_well_formed_reply(self, make_worker):
+        assert make_worker(b"ok 4\n<p/>").render(b"{}") == b"<p/>"
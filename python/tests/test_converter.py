@@ -1,14 +1,20 @@
+import gc
 import json
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from playwright_smart_reporter_python.converter import (
+    REQUIRED_RESULT_KEYS,
     _extract_error,
     _playwright_outcome,
     _status_from_outcome,
     _to_ms,
+    convert_pytest_data,
     convert_pytest_json,
+    convert_pytest_json_bytes,
 )
 
 
@@ -89,56 +95,186 @@ class TestExtractError:
     def test_empty_test(self):
         assert _extract_error({}) is None
 
+    def test_ignores_passed_phase_longrepr(self):
+        # pytest-json-report under xdist
+        header = "[gw0] linux -- Python 3.11.7 /usr/bin/python"
+        test = {
+            "setup": {"outcome": "passed", "longrepr": header},
+            "call": {"outcome": "passed", "longrepr": header},
+            "teardown": {"outcome": "passed", "longrepr": header},
+        }
+        assert _extract_error(test) is None
 
-class TestConvertPytestJson:
-    def test_structure(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        assert "results" in data
-        assert "history" in data
-        assert "startTime" in data
-        assert "options" in data
-
-    def test_result_count(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        assert len(data["results"]) == 4
-
-    def test_passed_test_fields(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        passed = data["results"][0]
-        assert passed["status"] == "passed"
-        assert passed["outcome"] == "expected"
-        assert passed["title"] == "TestLogin::test_valid_credentials"
-        assert passed["file"] == "tests/test_login.py"
-        assert passed["duration"] == 1234
-        assert passed["error"] is None
-
-    def test_failed_test_has_error(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        failed = data["results"][1]
-        assert failed["status"] == "failed"
-        assert failed["outcome"] == "unexpected"
-        assert "AssertionError" in failed["error"]
-
-    def test_skipped_test(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        skipped = data["results"][3]
-        assert skipped["status"] == "skipped"
-        assert skipped["outcome"] == "skipped"
-
-    def test_start_time_is_ms(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        assert data["startTime"] == 1700000000000
+    def test_failed_phase_after_passed_longrepr(self):
+        header = "[gw1] linux -- Python 3.11.7 /usr/bin/python"
+        test = {
+            "setup": {"outcome": "passed", "longrepr": header},
+            "call": {"outcome": "failed", "longrepr": header + "\n\nE   assert 1 == 2"},
+        }
+        assert _extract_error(test).endswith("assert 1 == 2")
 
-    def test_tags_from_keywords(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        assert data["results"][0]["tags"] == ["login", "smoke"]
 
-    def test_result_has_required_keys(self, sample_report_path):
-        data = convert_pytest_json(sample_report_path)
-        required = {
-            "testId", "title", "file", "status", "duration",
-            "error", "retry", "outcome", "expectedStatus",
-            "steps", "history", "tags", "attachments",
-        }
-        for result in data["results"]:
-            assert required.issubset(result.keys())
+class TestConvertPytestJson:
+    def test_structure(self, converted_sample):
+        assert "results" in converted_sample
+        assert "history" in converted_sample
+        assert "startTime" in converted_sample
+        assert "options" in converted_sample
+
+    def test_result_count(self, converted_sample):
+        assert len(converted_sample["results"]) == 4
+
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            (("results", 0, "status"), "passed"),
+            (("results", 0, "outcome"), "expected"),
+            (("results", 0, "title"), "TestLogin::test_valid_credentials"),
+            (("results", 0, "file"), "tests/test_login.py"),
+            (("results", 0, "duration"), 1234),
+            (("results", 0, "error"), None),
+            (("results", 0, "tags"), ["login", "smoke"]),
+            (("results", 1, "status"), "failed"),
+            (("results", 1, "outcome"), "unexpected"),
+            (("results", 3, "status"), "skipped"),
+            (("results", 3, "outcome"), "skipped"),
+            (("startTime",), 1700000000000),
+        ],
+        ids=lambda v: ".".join(map(str, v)) if isinstance(v, tuple) else None,
+    )
+    def test_field(self, converted_sample, path, expected):
+        value = converted_sample
+        for key in path:
+            value = value[key]
+        assert value == expected
+
+    def test_failed_test_has_error(self, converted_sample):
+        assert "AssertionError" in converted_sample["results"][1]["error"]
+
+    def test_result_has_required_keys(self, converted_sample):
+        missing = [
+            r.get("testId")
+            for r in converted_sample["results"]
+            if not REQUIRED_RESULT_KEYS <= r.keys()
+        ]
+        assert not missing, missing
+
+    def test_parallel_matches_serial(self, sample_report_path, converted_sample):
+        with patch(
+            "playwright_smart_reporter_python.converter._PARALLEL_MIN_TESTS", 2
+        ):
+            parallel = convert_pytest_json(sample_report_path, workers=3)
+        assert parallel == converted_sample
+
+    def test_convert_parsed_data(self, sample_raw, converted_sample):
+        assert convert_pytest_data(sample_raw) == converted_sample
+
+    def test_restores_gc_state(self, sample_report_path):
+        assert gc.isenabled()
+        convert_pytest_json(sample_report_path)
+        assert gc.isenabled()
+
+        gc.disable()
+        try:
+            convert_pytest_json(sample_report_path)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+
+class TestConvertPytestJsonBytes:
+    def test_matches_dict_conversion(self, sample_report_path, converted_sample):
+        assert json.loads(convert_pytest_json_bytes(sample_report_path)) == (
+            converted_sample
+        )
+
+    def test_matches_dict_conversion_for_awkward_input(self, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text(
+            json.dumps(
+                {
+                    "created": 1700000000.5,
+                    "tests": [
+                        {
+                            "nodeid": 'tests/test_ü.py::test_"quoted"[\\n]',
+                            "outcome": "failed",
+                            "duration": "0.25",
+                            "keywords": ["ünïcode", "with \"quotes\""],
+                            "call": {"longrepr": {"chain": [], "note": "✗"}},
+                        },
+                        {
+                            "nodeid": "tests/test_x.py::test_xdist_pass",
+                            "outcome": "passed",
+                            "call": {"outcome": "passed", "longrepr": "[gw0] linux"},
+                        },
+                        {"nodeid": "no_separator", "keywords": {"not": "a list"}},
+                        {"outcome": "error", "keywords": [1, None]},
+                    ],
+                }
+            ),
+            encoding="utf-8",
+        )
+        assert json.loads(convert_pytest_json_bytes(report)) == (
+            convert_pytest_json(report)
+        )
+
+
+class TestStreamingLoad:
+    @pytest.fixture(autouse=True)
+    def _stream_everything(self):
+        pytest.importorskip("ijson")
+        with patch(
+            "playwright_smart_reporter_python.converter._STREAM_MIN_BYTES", 0
+        ), patch.dict(os.environ, {"PSR_STREAM_JSON": "1"}):
+            yield
+
+    def test_streams_tests(self, sample_report_path):
+        from playwright_smart_reporter_python.converter import _load_report
+
+        assert not isinstance(_load_report(sample_report_path)["tests"], list)
+
+    def test_off_without_env_var(self, sample_report_path):
+        from playwright_smart_reporter_python.converter import _load_report
+
+        with patch.dict(os.environ):
+            del os.environ["PSR_STREAM_JSON"]
+            assert isinstance(_load_report(sample_report_path)["tests"], list)
+
+    def test_nan_falls_back_to_full_parse(self, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text(
+            '{"created": 1700000000.0, "tests": ['
+            '{"nodeid": "a.py::t1", "outcome": "passed", "duration": 0.5},'
+            '{"nodeid": "a.py::t2", "outcome": "passed", "duration": 0.5,'
+            ' "metadata": {"score": NaN}},'
+            '{"nodeid": "a.py::t3", "outcome": "failed", "duration": 0.5}]}'
+        )
+        data = convert_pytest_json(report)
+        assert [r["title"] for r in data["results"]] == ["t1", "t2", "t3"]
+        assert json.loads(convert_pytest_json_bytes(report)) == data
+
+    def test_nan_before_tests_falls_back(self, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text(
+            '{"environment": {"x": NaN}, "created": 1700000000.0,'
+            ' "tests": [{"nodeid": "a.py::t1", "outcome": "passed"}]}'
+        )
+        data = convert_pytest_json(report)
+        assert data["startTime"] == 1700000000000
+        assert len(data["results"]) == 1
+
+    def test_matches_full_parse(self, sample_report_path, converted_sample):
+        assert convert_pytest_json(sample_report_path) == converted_sample
+
+    def test_bytes_matches_full_parse(self, sample_report_path, converted_sample):
+        assert json.loads(convert_pytest_json_bytes(sample_report_path)) == (
+            converted_sample
+        )
+
+    def test_parallel_materialises_stream(self, sample_report_path, converted_sample):
+        with patch(
+            "playwright_smart_reporter_python.converter._PARALLEL_MIN_TESTS", 2
+        ):
+            assert convert_pytest_json(sample_report_path, workers=2) == (
+                converted_sample
+            )
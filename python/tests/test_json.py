@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+import pytest
+
+from playwright_smart_reporter_python import _json
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield _json
+    else:
+        with patch.object(_json, "orjson", None):
+            yield _json
+
+
+class TestJsonCodec:
+    def test_round_trip(self, codec):
+        obj = {"title": "ünïcode ✓", "duration": 1234, "error": None, "tags": []}
+        assert codec.loads(codec.dumps(obj)) == obj
+
+    def test_dumps_is_compact_bytes(self, codec):
+        out = codec.dumps({"a": [1, 2]})
+        assert isinstance(out, bytes)
+        assert out == b'{"a":[1,2]}'
+
+    def test_loads_accepts_nan(self, codec):
+        data = codec.loads(b'{"duration": NaN}')
+        assert data["duration"] != data["duration"]
+
+    def test_dumps_lone_surrogate(self, codec):
+        out = codec.dumps({"error": "bad \udc80 byte"})
+        assert codec.loads(out) == {"error": "bad \udc80 byte"}
@@ -1,47 +1,65 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from playwright_smart_reporter_python.plugin import (
+    SmartReporterPlugin,
+    pytest_addoption,
+    pytest_configure,
+    pytest_load_initial_conftests,
+)
 
-class TestPytestAddoption:
-    def test_registers_smart_reporter_flag(self):
-        from playwright_smart_reporter_python.plugin import pytest_addoption
 
-        mock_group = MagicMock()
-        mock_parser = MagicMock()
-        mock_parser.getgroup.return_value = mock_group
+class _Recorder:
+    """Stand-in option group that records addoption() calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def addoption(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
 
+@pytest.fixture
+def mock_parser():
+    parser = MagicMock()
+    parser.getgroup.return_value = _Recorder()
+    return parser
+
+
+class TestPytestAddoption:
+    def test_registers_smart_reporter_flag(self, mock_parser):
         pytest_addoption(mock_parser)
+        mock_group = mock_parser.getgroup.return_value
 
         mock_parser.getgroup.assert_called_once_with("smart-reporter")
-        calls = mock_group.addoption.call_args_list
-        assert len(calls) == 2
+        calls = mock_group.calls
+        assert len(calls) == 3
 
-        flag_names = [call[0][0] for call in calls]
+        flag_names = [args[0] for args, _ in calls]
         assert "--smart-reporter" in flag_names
         assert "--smart-reporter-output" in flag_names
+        assert "--smart-reporter-workers" in flag_names
 
-    def test_smart_reporter_flag_defaults_false(self):
-        from playwright_smart_reporter_python.plugin import pytest_addoption
-
-        mock_group = MagicMock()
-        mock_parser = MagicMock()
-        mock_parser.getgroup.return_value = mock_group
-
+    def test_smart_reporter_flag_defaults_false(self, mock_parser):
         pytest_addoption(mock_parser)
+        mock_group = mock_parser.getgroup.return_value
 
-        sr_call = [
-            c for c in mock_group.addoption.call_args_list
-            if c[0][0] == "--smart-reporter"
+        sr_kwargs = [
+            kwargs for args, kwargs in mock_group.calls
+            if args[0] == "--smart-reporter"
         ][0]
-        assert sr_call[1]["default"] is False
-        assert sr_call[1]["action"] == "store_true"
+        assert sr_kwargs["default"] is False
+        assert sr_kwargs["action"] == "store_true"
 
 
 class TestPytestConfigure:
     def test_skips_when_flag_not_set(self):
-        from playwright_smart_reporter_python.plugin import pytest_configure
-
         mock_config = MagicMock()
         mock_config.getoption.return_value = False
 
@@ -50,17 +68,153 @@ class TestPytestConfigure:
         mock_config.pluginmanager.register.assert_not_called()
 
     def test_registers_plugin_when_flag_set(self):
-        from playwright_smart_reporter_python.plugin import pytest_configure
-
         mock_config = MagicMock()
         mock_config.getoption.side_effect = lambda opt, **kw: {
             "--smart-reporter": True,
             "--smart-reporter-output": "smart-report.html",
         }.get(opt, kw.get("default"))
-        mock_config.option = MagicMock(spec=[])
+        mock_config.option = SimpleNamespace()
+        del mock_config.workerinput
 
         pytest_configure(mock_config)
 
         mock_config.pluginmanager.register.assert_called_once()
-        registered_plugin = mock_config.pluginmanager.register.call_args[0][0]
+        registered_plugin = mock_config.pluginmanager.register.call_args.args[0]
         assert registered_plugin.__class__.__name__ == "SmartReporterPlugin"
+
+    def test_skips_registration_in_xdist_worker(self):
+        mock_config = MagicMock()
+        mock_config.getoption.return_value = True
+        mock_config.workerinput = {"workerid": "gw0"}
+
+        pytest_configure(mock_config)
+
+        mock_config.pluginmanager.register.assert_not_called()
+
+    def test_registers_despite_inherited_worker_env(self):
+        # e.g. a nested pytest run started from inside an xdist worker
+        mock_config = MagicMock()
+        mock_config.getoption.side_effect = lambda opt, **kw: {
+            "--smart-reporter": True,
+            "--smart-reporter-output": "smart-report.html",
+        }.get(opt, kw.get("default"))
+        mock_config.option = SimpleNamespace()
+        del mock_config.workerinput
+
+        with patch.dict(os.environ, {"PYTEST_XDIST_WORKER": "gw0"}):
+            pytest_configure(mock_config)
+
+        mock_config.pluginmanager.register.assert_called_once()
+
+
+class TestSessionFinish:
+    def _finish(self, tmp_path, monkeypatch, backend):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".pytest-report.json").write_text("{}")
+        config = MagicMock()
+        config.getoption.return_value = str(tmp_path / "smart-report.html")
+
+        bridge = MagicMock(backend=backend)
+        with patch(
+            "playwright_smart_reporter_python.bridge.SmartReporterBridge",
+            return_value=bridge,
+        ):
+            SmartReporterPlugin(config).pytest_sessionfinish(MagicMock(), 0)
+        bridge.generate_report.assert_called_once()
+
+    def test_warns_on_python_fallback(self, tmp_path, monkeypatch, capsys):
+        self._finish(tmp_path, monkeypatch, "python")
+        out = capsys.readouterr().out
+        assert "static Python report" in out
+        assert "Smart Report generated (python backend)" in out
+
+    def test_node_backend_does_not_warn(self, tmp_path, monkeypatch, capsys):
+        self._finish(tmp_path, monkeypatch, "node")
+        out = capsys.readouterr().out
+        assert "static Python report" not in out
+        assert "Smart Report generated (node backend)" in out
+
+
+class TestLoadInitialConftests:
+    def _early_config(self, has_xdist=True, **options):
+        namespace = {
+            "smart_reporter": True,
+            "smart_reporter_workers": "4",
+            **options,
+        }
+        config = MagicMock()
+        config.known_args_namespace = SimpleNamespace(**namespace)
+        config.pluginmanager.has_plugin.return_value = has_xdist
+        return config
+
+    def _run(self, early_config, *extra_args):
+        args = ["tests", *extra_args]
+        pytest_load_initial_conftests(early_config, MagicMock(), args)
+        return args
+
+    def test_adds_xdist_args(self):
+        assert self._run(self._early_config()) == [
+            "tests", "-n", "4", "--dist", "loadfile",
+        ]
+
+    def test_auto_uses_cpu_count_minus_two(self):
+        with patch("os.cpu_count", return_value=8):
+            args = self._run(self._early_config(smart_reporter_workers="auto"))
+        assert args[1:3] == ["-n", "6"]
+
+    @pytest.mark.parametrize(
+        "explicit",
+        [
+            ["-n", "2"],
+            ["-n2"],
+            ["--numprocesses=2"],
+            ["--dist", "no"],
+            ["--dist=load"],
+        ],
+    )
+    def test_respects_explicit_xdist_args(self, explicit):
+        assert self._run(self._early_config(), *explicit) == ["tests", *explicit]
+
+    def test_noop_with_pdb(self):
+        assert self._run(self._early_config(usepdb=True)) == ["tests"]
+
+    def test_noop_with_trace(self):
+        assert self._run(self._early_config(trace=True)) == ["tests"]
+
+    def test_zero_disables(self):
+        assert self._run(self._early_config(smart_reporter_workers="0")) == ["tests"]
+
+    def test_noop_without_xdist(self):
+        assert self._run(self._early_config(has_xdist=False)) == ["tests"]
+
+    def test_noop_without_flag(self):
+        assert self._run(self._early_config(smart_reporter=False)) == ["tests"]
+
+
+class TestLazyImports:
+    def test_plugin_import_does_not_load_bridge(self):
+        code = (
+            "import sys, playwright_smart_reporter_python.plugin; "
+            "print(sorted(m for m in sys.modules if m.endswith(('.bridge', '.converter'))))"
+        )
+        # Find the package from this checkout, wherever pytest is run from
+        package_dir = str(Path(__file__).resolve().parent.parent)
+        pythonpath = os.pathsep.join(
+            filter(None, [package_dir, os.environ.get("PYTHONPATH")])
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": pythonpath},
+        ).stdout
+        assert out.strip() == "[]"
+
+    def test_package_still_exports_bridge(self):
+        import playwright_smart_reporter_python as pkg
+        from playwright_smart_reporter_python.bridge import SmartReporterBridge
+
+        assert pkg.SmartReporterBridge is SmartReporterBridge
+        with pytest.raises(AttributeError):
+            pkg.does_not_exist
@@ -0,0 +1,56 @@
+from playwright_smart_reporter_python.py_generator import (
+    _format_duration,
+    generate_html,
+)
+
+
+class TestFormatDuration:
+    def test_milliseconds(self):
+        assert _format_duration(450) == "450ms"
+
+    def test_seconds(self):
+        assert _format_duration(1500) == "1.5s"
+
+    def test_minutes(self):
+        assert _format_duration(90000) == "1.5m"
+
+
+class TestGenerateHtml:
+    def test_summary_counts(self, converted_sample):
+        html = generate_html(converted_sample)
+        assert html.startswith("<!DOCTYPE html>")
+        # 4 tests: 2 passed, 1 failed, 1 skipped
+        assert '<div class="stat-value ">4</div>' in html
+        assert '<div class="stat-value passed">2</div>' in html
+        assert '<div class="stat-value failed">1</div>' in html
+        assert '<div class="stat-value skipped">1</div>' in html
+        assert "50%" in html
+
+    def test_lists_every_test(self, converted_sample):
+        html = generate_html(converted_sample)
+        for result in converted_sample["results"]:
+            assert result["title"] in html
+
+    def test_escapes_user_content(self):
+        html = generate_html(
+            {
+                "results": [
+                    {
+                        "title": "<script>alert(1)</script>",
+                        "file": "a.py",
+                        "status": "failed",
+                        "outcome": "unexpected",
+                        "duration": 5,
+                        "error": "assert '<b>' == 1",
+                    }
+                ],
+                "startTime": 0,
+            }
+        )
+        assert "<script>alert" not in html
+        assert "&lt;script&gt;" in html
+        assert "&lt;b&gt;" in html
+
+    def test_empty_report(self):
+        html = generate_html({"results": [], "startTime": 0})
+        assert "0%" in html